@@ -7,17 +7,249 @@ It triggers the GitHub Actions workflow to redeploy the Cloud Run service.
 
 import os
 import sys
+import json
+import time
+import random
 import subprocess
 import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Optional
 
 
+GITHUB_API_URL = "https://api.github.com"
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Runs created this long before the local dispatch time still count as ours
+CLOCK_SKEW_SECONDS = 120
+# Title of a dispatched run; must match run-name in model-promotion.yml
+RUN_NAME_PREFIX = "Model promotion v"
+
+# Abort before dispatching if fewer core API requests than this remain
+RATE_LIMIT_FLOOR = int(os.getenv("GITHUB_RATE_LIMIT_FLOOR", "10"))
+
+# ETags of GET responses; 304 Not Modified replies don't count against the quota
+ETAG_CACHE_PATH = Path(
+    os.getenv("GITHUB_ETAG_CACHE", "~/.cache/mlops/gh_etags.json")
+).expanduser()
+_etag_cache = None
+
+# Shared keep-alive session, created on first API call
+_SESSION = None
+
+
+def _get_session():
+    """Return the module-level requests session with a pooled adapter."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        _SESSION = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        _SESSION.mount("https://", adapter)
+    return _SESSION
+
+
+def _is_retryable(response, retry_server_errors: bool = True) -> bool:
+    """Rate-limited (429, or 403 with rate-limit headers) and, optionally, 5xx responses are retried."""
+    if response.status_code == 429:
+        return True
+    if response.status_code >= 500:
+        return retry_server_errors
+    if response.status_code == 403:
+        return (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+    return False
+
+
+def _retry_delay(response, attempt: int) -> float:
+    """Seconds to wait before the next attempt, honoring GitHub's rate-limit headers."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset is not None and response.headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _request_with_backoff(method: str, url: str, retry_server_errors: bool = True, **kwargs):
+    """
+    Send a GitHub API request, retrying rate-limited and 5xx responses.
+    
+    Pass retry_server_errors=False for requests that are not idempotent: a 5xx
+    does not mean GitHub did not act on it, while a rate-limited one was rejected.
+    Waits are capped at BACKOFF_MAX_SECONDS; when Retry-After or the rate-limit
+    reset asks for longer, the rate-limited response is returned as is.
+    """
+    session = _get_session()
+    kwargs.setdefault("timeout", 10)
+    
+    for attempt in range(MAX_RETRIES + 1):
+        response = session.request(method, url, **kwargs)
+        
+        if attempt == MAX_RETRIES or not _is_retryable(response, retry_server_errors):
+            return response
+        
+        delay = _retry_delay(response, attempt)
+        if delay > BACKOFF_MAX_SECONDS:
+            # Retrying earlier than GitHub asks is pointless; give up instead of sleeping for up to an hour
+            print(f"⚠️ GitHub API returned {response.status_code} and asks to wait {delay:.0f}s, giving up")
+            return response
+        print(f"⏳ GitHub API returned {response.status_code}, retrying in {delay:.1f}s...")
+        time.sleep(delay)
+    
+    return response
+
+
+def _api_headers(github_token: str) -> dict:
+    return {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+
+def _load_etag_cache() -> dict:
+    global _etag_cache
+    if _etag_cache is None:
+        try:
+            _etag_cache = json.loads(ETAG_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            _etag_cache = {}
+    return _etag_cache
+
+
+def _save_etag_cache() -> None:
+    try:
+        ETAG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ETAG_CACHE_PATH.write_text(json.dumps(_etag_cache))
+    except OSError as e:
+        print(f"⚠️ Could not write ETag cache: {e}")
+
+
+def cached_get(url: str, github_token: str) -> Optional[dict]:
+    """
+    GET a GitHub API URL with If-None-Match, reusing the cached body on 304.
+    
+    Returns:
+        Parsed JSON body, or None if the request failed
+    """
+    cache = _load_etag_cache()
+    headers = _api_headers(github_token)
+    cached = cache.get(url)
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    
+    response = _request_with_backoff("GET", url, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        return cached["body"]
+    
+    if response.status_code != 200:
+        print(f"⚠️ GET {url} failed: {response.status_code}")
+        return None
+    
+    body = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        cache[url] = {"etag": etag, "body": body}
+        _save_etag_cache()
+    return body
+
+
+def get_rate_limit_remaining(github_token: str) -> Optional[int]:
+    """Remaining core API requests; /rate_limit itself is not counted against the quota."""
+    response = _request_with_backoff(
+        "GET", f"{GITHUB_API_URL}/rate_limit", headers=_api_headers(github_token)
+    )
+    if response.status_code != 200:
+        return None
+    return response.json()["resources"]["core"]["remaining"]
+
+
+def _is_dispatched_run(run: dict, model_version: str, not_before: datetime) -> bool:
+    """Whether a listed run is the one dispatched for model_version."""
+    created_at = datetime.fromisoformat(run["created_at"].replace("Z", "+00:00"))
+    if created_at < not_before:
+        return False
+    title = run.get("display_title", "")
+    # Workflows without our run-name can only be matched on creation time
+    return title == f"{RUN_NAME_PREFIX}{model_version}" or not title.startswith(RUN_NAME_PREFIX)
+
+
+def wait_for_workflow_run(
+    repo_owner: str,
+    repo_name: str,
+    workflow_file: str,
+    github_token: str,
+    model_version: str,
+    dispatched_at: datetime,
+    poll_interval: float = 15,
+    timeout: float = 1800
+) -> bool:
+    """
+    Poll the workflow run started by a dispatch until it completes.
+    
+    The run is identified by its title, which carries the model version, and
+    by a creation time no earlier than dispatched_at minus CLOCK_SKEW_SECONDS
+    (dispatched_at comes from the local clock, created_at from GitHub's).
+    
+    Returns:
+        True if the run concluded successfully
+    """
+    url = (
+        f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/actions/workflows/"
+        f"{workflow_file}/runs?event=workflow_dispatch&per_page=20"
+    )
+    not_before = dispatched_at - timedelta(seconds=CLOCK_SKEW_SECONDS)
+    deadline = time.monotonic() + timeout
+    run_id = None
+    
+    while time.monotonic() < deadline:
+        body = cached_get(url, github_token)
+        listed = (body or {}).get("workflow_runs", [])
+        if run_id is None:
+            # Newest first; the oldest match is the earliest run after our dispatch
+            runs = [r for r in listed if _is_dispatched_run(r, model_version, not_before)][-1:]
+        else:
+            runs = [r for r in listed if r["id"] == run_id]
+        
+        if runs:
+            run = runs[0]
+            run_id = run["id"]
+            if run["status"] == "completed":
+                print(f"🏁 Workflow run finished: {run['conclusion']}")
+                print(f"🔗 {run['html_url']}")
+                return run["conclusion"] == "success"
+            print(f"⏳ Workflow run {run['status']}...")
+        
+        time.sleep(poll_interval)
+    
+    print(f"❌ Timed out after {timeout:.0f}s waiting for workflow run")
+    return False
+
+
 def trigger_github_workflow(
     model_version: str,
     repo_owner: str,
     repo_name: str,
     workflow_file: str = "model-promotion.yml",
-    github_token: Optional[str] = None
+    github_token: Optional[str] = None,
+    wait: bool = False
 ) -> None:
     """
     Trigger GitHub Actions workflow after model promotion.
@@ -28,10 +260,21 @@ def trigger_github_workflow(
         repo_name: GitHub repository name
         workflow_file: Workflow file name
         github_token: GitHub personal access token (optional, uses gh CLI if not provided)
+        wait: Poll the triggered run until it completes (requires a token)
     """
     
     print(f"🔄 Triggering model promotion workflow for version {model_version}")
     
+    # With a token, call the REST API directly and skip spawning gh
+    if github_token:
+        dispatched_at = datetime.now(timezone.utc).replace(microsecond=0)
+        trigger_via_api(model_version, repo_owner, repo_name, workflow_file, github_token)
+        if wait and not wait_for_workflow_run(
+            repo_owner, repo_name, workflow_file, github_token, model_version, dispatched_at
+        ):
+            sys.exit(1)
+        return
+    
     # Option 1: Use GitHub CLI (recommended)
     try:
         cmd = [
@@ -49,21 +292,16 @@ def trigger_github_workflow(
             return
         else:
             print(f"⚠️ gh CLI failed: {result.stderr}")
-            print("Falling back to direct API call...")
             
     except FileNotFoundError:
         print("⚠️ GitHub CLI (gh) not found. Install from: https://cli.github.com/")
-        print("Falling back to direct API call...")
     
-    # Option 2: Use GitHub API directly
-    if github_token:
-        trigger_via_api(model_version, repo_owner, repo_name, workflow_file, github_token)
-    else:
-        print("❌ No GitHub token provided. Please either:")
-        print("   1. Install GitHub CLI: https://cli.github.com/")
-        print("   2. Provide --github-token parameter")
-        print("   3. Manually trigger at: https://github.com/{repo_owner}/{repo_name}/actions")
-        sys.exit(1)
+    # The REST API needs a token, and none was provided
+    print("❌ No GitHub token provided. Please either:")
+    print("   1. Install and authenticate GitHub CLI: https://cli.github.com/")
+    print("   2. Provide --github-token parameter")
+    print(f"   3. Manually trigger at: https://github.com/{repo_owner}/{repo_name}/actions")
+    sys.exit(1)
 
 
 def trigger_via_api(
@@ -74,14 +312,14 @@ def trigger_via_api(
     github_token: str
 ) -> None:
     """Trigger workflow using GitHub REST API."""
-    import requests
+    remaining = get_rate_limit_remaining(github_token)
+    if remaining is not None and remaining < RATE_LIMIT_FLOOR:
+        print(f"❌ Only {remaining} GitHub API requests left (floor: {RATE_LIMIT_FLOOR}), not dispatching")
+        sys.exit(1)
     
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/actions/workflows/{workflow_file}/dispatches"
+    url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/actions/workflows/{workflow_file}/dispatches"
     
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    headers = _api_headers(github_token)
     
     data = {
         "ref": "main",
@@ -90,7 +328,11 @@ def trigger_via_api(
         }
     }
     
-    response = requests.post(url, headers=headers, json=data)
+    # A dispatch that failed with 5xx may still have started a run; only
+    # rate-limited attempts are retried so a deployment is never triggered twice
+    response = _request_with_backoff(
+        "POST", url, retry_server_errors=False, headers=headers, json=data
+    )
     
     if response.status_code == 204:
         print(f"✅ Workflow triggered successfully via API!")
@@ -128,7 +370,13 @@ def main():
     )
     parser.add_argument(
         "--github-token",
-        help="GitHub personal access token (optional if gh CLI is installed)"
+        default=os.getenv("GITHUB_TOKEN"),
+        help="GitHub personal access token (defaults to $GITHUB_TOKEN; optional if gh CLI is installed)"
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Wait for the triggered workflow run to finish (requires a GitHub token)"
     )
     
     args = parser.parse_args()
@@ -138,7 +386,8 @@ def main():
         repo_owner=args.repo_owner,
         repo_name=args.repo_name,
         workflow_file=args.workflow_file,
-        github_token=args.github_token
+        github_token=args.github_token,
+        wait=args.wait
     )
 
 
@@ -1,5 +1,14 @@
 import pandas as pd
 import numpy as np
+import holidays
+
+# Category order of 'gender' for XGBoost's native categorical support;
+# the position of each value is the code the booster splits on
+GENDER_CATEGORIES = ['F', 'M']
+
+# Brazilian public holidays (dataset is from Vitória, ES), computed once at import
+HOLIDAY_YEARS = range(2015, 2030)
+HOLIDAY_DATES = frozenset(holidays.Brazil(years=HOLIDAY_YEARS).keys())
 
 def load_data(path: str) -> pd.DataFrame:
     """Load raw data and rename columns to standard format"""
@@ -59,7 +68,9 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
         
     df['hour_block'] = df['appointment_hour'].apply(get_hour_block)
     df['day_of_week'] = df['appointment_day'].dt.dayofweek
-    df['is_holiday_or_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
+    df['is_holiday_or_weekend'] = (
+        df['day_of_week'].isin([5, 6]) | df['appointment_date'].isin(HOLIDAY_DATES)
+    ).astype(int)
     
     # calc lead time
     df['lead_time_days'] = (df['appointment_day'] - df['scheduled_day']).dt.days
@@ -68,6 +79,11 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
+def encode_categoricals(df: pd.DataFrame, gender_categories: list = GENDER_CATEGORIES) -> pd.DataFrame:
+    """Mark categorical columns so XGBoost handles them without label encoding"""
+    df['gender'] = pd.Categorical(df['gender'], categories=gender_categories)
+    return df
+
 def engineer_patient_history(df: pd.DataFrame) -> pd.DataFrame:
     """Engineer features based on patient history. 
     Note: In production inference, these would be fetched from a feature store."""
@@ -0,0 +1,129 @@
+"""
+Single-row feature builder for online inference.
+
+Computes the same features as preprocess() + build_features() for one
+appointment from typed scalars, without going through pandas. Used by
+/predict; batch inference keeps the pandas pipeline.
+"""
+
+import numpy as np
+from datetime import date, datetime, timedelta
+from numba import njit
+
+from src.feature_engineering import HOLIDAY_DATES, HOLIDAY_YEARS
+
+N_FEATURES = 14
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+
+# Calendar lookup tables indexed by weekday / epoch day, built at import time.
+# They are passed to the jitted functions as arguments: globals would be frozen
+# into numba's on-disk cache and go stale when the holiday calendar changes.
+WEEKEND_LUT = np.array([0, 0, 0, 0, 0, 1, 1], dtype=np.bool_)
+HOLIDAY_LUT_START = (date(HOLIDAY_YEARS[0], 1, 1) - _EPOCH.date()).days
+HOLIDAY_LUT = np.zeros(
+    (date(HOLIDAY_YEARS[-1] + 1, 1, 1) - _EPOCH.date()).days - HOLIDAY_LUT_START,
+    dtype=np.bool_
+)
+for _holiday in HOLIDAY_DATES:
+    HOLIDAY_LUT[(_holiday - _EPOCH.date()).days - HOLIDAY_LUT_START] = True
+
+
+def wall_clock_seconds(scheduled_day: str, appointment_day: str):
+    """
+    Parse the request timestamps into integer seconds since the epoch on the
+    appointment's wall clock, so hour/weekday/month match pandas' .dt accessors.
+    Both timestamps must carry a UTC offset or neither, as pandas requires.
+    """
+    scheduled = datetime.fromisoformat(scheduled_day)
+    appointment = datetime.fromisoformat(appointment_day)
+
+    if (scheduled.tzinfo is None) != (appointment.tzinfo is None):
+        raise ValueError(
+            "scheduled_day and appointment_day must both include a UTC offset or both omit it"
+        )
+    if scheduled.tzinfo is not None:
+        scheduled = scheduled.astimezone(appointment.tzinfo)
+
+    sched_ts = (scheduled.replace(tzinfo=None) - _EPOCH) // timedelta(seconds=1)
+    appt_ts = (appointment.replace(tzinfo=None) - _EPOCH) // timedelta(seconds=1)
+    return sched_ts, appt_ts
+
+
+@njit(cache=True)
+def _month_from_epoch_day(epoch_day):
+    # Civil-from-days (proleptic Gregorian), month part only
+    z = epoch_day + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    return mp + 3 if mp < 10 else mp - 9
+
+
+@njit(cache=True)
+def _is_holiday_or_weekend(epoch_day, day_of_week, weekend_lut, holiday_lut, holiday_lut_start):
+    if weekend_lut[day_of_week]:
+        return 1
+    i = epoch_day - holiday_lut_start
+    return 1 if 0 <= i < holiday_lut.shape[0] and holiday_lut[i] else 0
+
+
+@njit(cache=True)
+def _build_row(
+    age, gender_code, sched_ts, appt_ts,
+    scholarship, hypertension, diabetes, alcoholism, handicap, sms_received,
+    weekend_lut, holiday_lut, holiday_lut_start
+):
+    appt_day = appt_ts // SECONDS_PER_DAY
+    hour = (appt_ts - appt_day * SECONDS_PER_DAY) // 3600
+
+    if hour < 8:
+        hour_block = 0  # early morning
+    elif hour < 12:
+        hour_block = 1  # morning
+    elif hour < 16:
+        hour_block = 2  # afternoon
+    else:
+        hour_block = 3  # evening
+
+    # 1970-01-01 was a Thursday; Monday == 0 like pandas' dayofweek
+    day_of_week = (appt_day + 3) % 7
+    lead_time_days = (appt_ts - sched_ts) // SECONDS_PER_DAY
+
+    row = np.empty(N_FEATURES, dtype=np.float32)
+    row[0] = hour_block
+    row[1] = day_of_week
+    row[2] = _is_holiday_or_weekend(
+        appt_day, day_of_week, weekend_lut, holiday_lut, holiday_lut_start
+    )
+    row[3] = lead_time_days
+    row[4] = 1 if lead_time_days == 0 else 0
+    row[5] = _month_from_epoch_day(appt_day)
+    row[6] = age
+    row[7] = gender_code
+    row[8] = scholarship
+    row[9] = hypertension
+    row[10] = diabetes
+    row[11] = alcoholism
+    row[12] = handicap
+    row[13] = sms_received
+    return row
+
+
+def build_row(
+    age, gender_code, sched_ts, appt_ts,
+    scholarship, hypertension, diabetes, alcoholism, handicap, sms_received
+):
+    """Return the model's feature vector, in training feature order."""
+    return _build_row(
+        age, gender_code, sched_ts, appt_ts,
+        scholarship, hypertension, diabetes, alcoholism, handicap, sms_received,
+        WEEKEND_LUT, HOLIDAY_LUT, HOLIDAY_LUT_START
+    )
+
+
+def warmup():
+    """Trigger JIT compilation (or load it from cache) before the first request."""
+    build_row(0, 0.0, 0, 0, 0, 0, 0, 0, 0, 0)
@@ -0,0 +1,42 @@
+"""
+Non-blocking logging for the pipeline and the prediction API.
+
+All ``mlops.*`` loggers hand records to an in-memory queue; a single
+background listener thread per process writes them to stdout, so callers
+never wait on the stream.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+_ROOT_LOGGER = "mlops"
+_listener = None
+
+
+def _start_listener() -> None:
+    global _listener
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger(_ROOT_LOGGER)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the ``mlops.<name>`` logger, starting the queue listener on first use."""
+    if _listener is None:
+        _start_listener()
+    return logging.getLogger(f"{_ROOT_LOGGER}.{name}")
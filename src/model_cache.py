@@ -0,0 +1,133 @@
+"""
+Local disk cache for MLflow pyfunc models.
+
+Registered model versions are immutable, so once a version has been
+downloaded and deserialized it is pickled under
+``<cache_dir>/<model name>/<version>-<digest>/model.pkl`` and later loads
+skip the artifact download. The cache keeps at most ``max_versions``
+entries per model, evicting the least recently used. Uvicorn workers share
+the cache: one downloads a version while the others wait and then read it.
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; downloads are then unsynchronized
+    fcntl = None
+
+import mlflow.pyfunc
+
+from src.logging_utils import get_logger
+
+logger = get_logger("model_cache")
+
+MODEL_CACHE_DIR = Path(
+    os.getenv("MODEL_CACHE_DIR", "~/.cache/mlops/models")
+).expanduser()
+MODEL_CACHE_TTL_SECONDS = float(os.getenv("MODEL_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+MODEL_CACHE_MAX_VERSIONS = int(os.getenv("MODEL_CACHE_MAX_VERSIONS", "3"))
+
+
+def _cache_entry(model_version) -> Path:
+    key = f"{model_version.name}/{model_version.version}/{model_version.run_id}/{model_version.source}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:12]
+    return MODEL_CACHE_DIR / model_version.name / f"{model_version.version}-{digest}"
+
+
+def _evict(model_dir: Path, max_versions: int) -> None:
+    """Drop the least recently used entries beyond max_versions."""
+    entries = sorted(
+        (p for p in model_dir.iterdir() if p.is_dir()),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+    for stale in entries[max_versions:]:
+        shutil.rmtree(stale, ignore_errors=True)
+        (model_dir / f"{stale.name}.lock").unlink(missing_ok=True)
+
+
+@contextmanager
+def _download_lock(entry: Path):
+    """Serialize downloads of one entry across worker processes."""
+    if fcntl is None:
+        yield
+        return
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    with open(entry.parent / f"{entry.name}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_cached(entry: Path, ttl_seconds: float):
+    """Return the cached model for an entry, or None if missing, stale or unreadable."""
+    path = entry / "model.pkl"
+    try:
+        if path.exists() and time.time() - path.stat().st_mtime < ttl_seconds:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+            os.utime(entry)  # mark as recently used
+            return model
+    except Exception as e:
+        logger.warning(f"⚠️ Ignoring unreadable model cache entry {entry}: {e}")
+    return None
+
+
+def load_model_cached(
+    model_version,
+    ttl_seconds: float = MODEL_CACHE_TTL_SECONDS,
+    max_versions: int = MODEL_CACHE_MAX_VERSIONS
+):
+    """
+    Load a registered model version, reusing the local pickle when fresh.
+
+    Args:
+        model_version: MLflow ModelVersion to load
+        ttl_seconds: Maximum age of a cached pickle before it is re-downloaded
+        max_versions: Number of versions kept per model
+
+    Returns:
+        The loaded pyfunc model
+    """
+    entry = _cache_entry(model_version)
+    path = entry / "model.pkl"
+
+    model = _read_cached(entry, ttl_seconds)
+    if model is not None:
+        logger.info(f"📂 Loaded {model_version.name} v{model_version.version} from local cache")
+        return model
+
+    with _download_lock(entry):
+        # Another worker may have filled the entry while we waited for the lock
+        model = _read_cached(entry, ttl_seconds)
+        if model is not None:
+            logger.info(f"📂 Loaded {model_version.name} v{model_version.version} from local cache")
+            return model
+
+        model = mlflow.pyfunc.load_model(f"models:/{model_version.name}/{model_version.version}")
+
+        tmp_path = None
+        try:
+            entry.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            with tempfile.NamedTemporaryFile(dir=entry, delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(model, f)
+            os.replace(tmp_path, path)
+            _evict(entry.parent, max_versions)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not cache model locally: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    return model
@@ -6,9 +6,24 @@ and promote them to Production stage based on performance metrics.
 """
 
 import mlflow
+from mlflow.entities.model_registry import ModelVersion
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import RESOURCE_DOES_NOT_EXIST, ErrorCode
 from mlflow.tracking import MlflowClient
+from pathlib import Path
 from typing import Dict, Optional, List
 import os
+import sqlite3
+import time
+
+from src.logging_utils import get_logger
+
+logger = get_logger("registry")
+
+PROMOTION_CACHE_PATH = os.getenv("MLOPS_PROMOTION_CACHE", "~/.cache/mlops/promotion.db")
+PROMOTION_CACHE_MAX_ROWS = 100
+# One decision per run, model and comparison metric
+DECISION_KEY = ("run_id", "model_name", "metric")
 
 
 class ModelRegistry:
@@ -17,12 +32,98 @@ class ModelRegistry:
     def __init__(
         self,
         tracking_uri: str = "file:///app/mlruns",
-        model_name: str = "noshow-prediction-model"
+        model_name: str = "noshow-prediction-model",
+        decision_cache_path: Optional[str] = PROMOTION_CACHE_PATH,
+        decision_ttl_seconds: float = 24 * 3600
     ):
         self.tracking_uri = tracking_uri
         self.model_name = model_name
+        # register_model goes through mlflow's global client, so point it here too
         mlflow.set_tracking_uri(tracking_uri)
-        self.client = MlflowClient()
+        # Reused by every other method
+        self.client = MlflowClient(tracking_uri=tracking_uri)
+        self.decision_ttl_seconds = decision_ttl_seconds
+        self.decisions = self._open_decision_cache(decision_cache_path)
+    
+    def _open_decision_cache(self, path: Optional[str]) -> Optional[sqlite3.Connection]:
+        """
+        Open the SQLite sidecar recording past promotion decisions, so CI
+        reruns for the same run can skip re-registering and re-comparing.
+        """
+        if path is None:
+            return None
+        try:
+            db_path = Path(path).expanduser()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path)
+            # Caches keyed on run_id alone let one metric or model overwrite
+            # another's decision; they only hold cache entries, so start over
+            columns = conn.execute("PRAGMA table_info(decisions)").fetchall()
+            key = [c[1] for c in sorted(columns, key=lambda c: c[5]) if c[5]]
+            if key and key != list(DECISION_KEY):
+                with conn:
+                    conn.execute("DROP TABLE decisions")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                "run_id TEXT, model_name TEXT, version TEXT, "
+                "prod_version TEXT, metric TEXT, decided INTEGER, ts REAL, "
+                f"PRIMARY KEY ({', '.join(DECISION_KEY)}))"
+            )
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠️ Promotion decision cache disabled: {e}")
+            return None
+    
+    def _cached_decision(
+        self,
+        run_id: str,
+        metric_name: str,
+        prod_version: Optional[str]
+    ) -> Optional[tuple]:
+        """
+        Return (version, decided) for a run evaluated recently against the
+        same Production version, or None if it has to be evaluated again.
+        """
+        if self.decisions is None:
+            return None
+        row = self.decisions.execute(
+            "SELECT version, prod_version, decided, ts FROM decisions "
+            "WHERE run_id = ? AND model_name = ? AND metric = ?",
+            (run_id, self.model_name, metric_name)
+        ).fetchone()
+        if row is None:
+            return None
+        version, cached_prod_version, decided, ts = row
+        prod_version = None if prod_version is None else str(prod_version)
+        if cached_prod_version != prod_version or time.time() - ts > self.decision_ttl_seconds:
+            return None
+        return version, bool(decided)
+    
+    def _record_decision(
+        self,
+        run_id: str,
+        version: str,
+        prod_version: Optional[str],
+        metric_name: str,
+        decided: bool
+    ) -> None:
+        """Store a decision with the Production version it left in place."""
+        if self.decisions is None:
+            return
+        with self.decisions:
+            self.decisions.execute(
+                "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, self.model_name, str(version),
+                    None if prod_version is None else str(prod_version),
+                    metric_name, int(decided), time.time()
+                )
+            )
+            self.decisions.execute(
+                "DELETE FROM decisions WHERE rowid NOT IN "
+                "(SELECT rowid FROM decisions ORDER BY ts DESC LIMIT ?)",
+                (PROMOTION_CACHE_MAX_ROWS,)
+            )
     
     def register_model(
         self,
@@ -43,34 +144,53 @@ class ModelRegistry:
         """
         model_uri = f"runs:/{run_id}/{artifact_path}"
         
-        print(f"📦 Registering model from run: {run_id}")
+        logger.info(f"📦 Registering model from run: {run_id}")
         
+        # mlflow.register_model resolves runs:/ URIs to the run's LoggedModel
+        # (models:/m-...), which is where MLflow 3 stores the artifacts
         model_version = mlflow.register_model(
             model_uri=model_uri,
             name=self.model_name,
             tags=tags
         )
         
-        version = model_version.version
-        print(f"✅ Model registered: {self.model_name} v{version}")
+        version = str(model_version.version)
+        logger.info(f"✅ Model registered: {self.model_name} v{version}")
         
         return version
     
-    def get_production_model_metrics(self) -> Optional[Dict[str, float]]:
+    def get_production_versions(self) -> List[ModelVersion]:
+        """Get the model versions currently in Production stage."""
+        try:
+            return self.client.get_latest_versions(
+                self.model_name,
+                stages=["Production"]
+            )
+        except MlflowException as e:
+            # First training run: the registered model is only created on registration
+            if e.error_code == ErrorCode.Name(RESOURCE_DOES_NOT_EXIST):
+                return []
+            raise
+    
+    def get_production_model_metrics(
+        self,
+        prod_versions: Optional[List[ModelVersion]] = None
+    ) -> Optional[Dict[str, float]]:
         """
         Get metrics of the current Production model.
         
+        Args:
+            prod_versions: Already fetched Production versions (skips the lookup)
+        
         Returns:
             Dictionary of metrics or None if no Production model exists
         """
         try:
-            prod_versions = self.client.get_latest_versions(
-                self.model_name,
-                stages=["Production"]
-            )
+            if prod_versions is None:
+                prod_versions = self.get_production_versions()
             
             if not prod_versions:
-                print("ℹ️ No Production model found")
+                logger.info("ℹ️ No Production model found")
                 return None
             
             prod_version = prod_versions[0]
@@ -79,14 +199,16 @@ class ModelRegistry:
             return run.data.metrics
             
         except Exception as e:
-            print(f"⚠️ Error getting Production model metrics: {e}")
+            logger.warning(f"⚠️ Error getting Production model metrics: {e}")
             return None
     
     def compare_models(
         self,
         candidate_run_id: str,
         metric_name: str = "auc",
-        higher_is_better: bool = True
+        higher_is_better: bool = True,
+        prod_metrics: Optional[Dict[str, float]] = None,
+        prod_versions: Optional[List[ModelVersion]] = None
     ) -> bool:
         """
         Compare candidate model against current Production model.
@@ -95,6 +217,8 @@ class ModelRegistry:
             candidate_run_id: Run ID of the candidate model
             metric_name: Metric to compare (e.g., 'auc', 'f1')
             higher_is_better: Whether higher metric values are better
+            prod_metrics: Already fetched Production metrics (skips the lookup)
+            prod_versions: Already fetched Production versions (skips the lookup)
             
         Returns:
             True if candidate is better, False otherwise
@@ -104,20 +228,21 @@ class ModelRegistry:
         candidate_metric = candidate_run.data.metrics.get(metric_name)
         
         if candidate_metric is None:
-            print(f"⚠️ Metric '{metric_name}' not found in candidate run")
+            logger.warning(f"⚠️ Metric '{metric_name}' not found in candidate run")
             return False
         
         # Get production metrics
-        prod_metrics = self.get_production_model_metrics()
+        if prod_metrics is None:
+            prod_metrics = self.get_production_model_metrics(prod_versions)
         
         if prod_metrics is None:
-            print("✅ No Production model - candidate will be promoted")
+            logger.info("✅ No Production model - candidate will be promoted")
             return True
         
         prod_metric = prod_metrics.get(metric_name)
         
         if prod_metric is None:
-            print(f"⚠️ Metric '{metric_name}' not found in Production model")
+            logger.warning(f"⚠️ Metric '{metric_name}' not found in Production model")
             return True
         
         # Compare
@@ -126,17 +251,18 @@ class ModelRegistry:
         else:
             is_better = candidate_metric < prod_metric
         
-        print(f"\n📊 Model Comparison ({metric_name}):")
-        print(f"   Production: {prod_metric:.4f}")
-        print(f"   Candidate:  {candidate_metric:.4f}")
-        print(f"   Result: {'✅ BETTER' if is_better else '❌ WORSE'}\n")
+        logger.info(f"📊 Model Comparison ({metric_name}):")
+        logger.info(f"   Production: {prod_metric:.4f}")
+        logger.info(f"   Candidate:  {candidate_metric:.4f}")
+        logger.info(f"   Result: {'✅ BETTER' if is_better else '❌ WORSE'}")
         
         return is_better
     
     def promote_to_production(
         self,
         version: str,
-        archive_existing: bool = True
+        archive_existing: bool = True,
+        existing_prod_versions: Optional[List[ModelVersion]] = None
     ) -> bool:
         """
         Promote a model version to Production stage.
@@ -144,39 +270,31 @@ class ModelRegistry:
         Args:
             version: Model version to promote
             archive_existing: Whether to archive existing Production models
+            existing_prod_versions: Current Production versions, only used for logging
             
         Returns:
             True if promotion succeeded
         """
         try:
-            # Archive existing Production models
-            if archive_existing:
-                prod_versions = self.client.get_latest_versions(
-                    self.model_name,
-                    stages=["Production"]
-                )
-                
-                for prod_version in prod_versions:
-                    print(f"📦 Archiving v{prod_version.version}")
-                    self.client.transition_model_version_stage(
-                        name=self.model_name,
-                        version=prod_version.version,
-                        stage="Archived"
-                    )
+            # Archiving happens in the same call, so Production is never empty
+            if archive_existing and existing_prod_versions:
+                for prod_version in existing_prod_versions:
+                    logger.info(f"📦 Archiving v{prod_version.version}")
             
             # Promote new version
-            print(f"🚀 Promoting v{version} to Production")
+            logger.info(f"🚀 Promoting v{version} to Production")
             self.client.transition_model_version_stage(
                 name=self.model_name,
                 version=version,
-                stage="Production"
+                stage="Production",
+                archive_existing_versions=archive_existing
             )
             
-            print(f"✅ Model v{version} is now in Production!")
+            logger.info(f"✅ Model v{version} is now in Production!")
             return True
             
         except Exception as e:
-            print(f"❌ Promotion failed: {e}")
+            logger.error(f"❌ Promotion failed: {e}")
             return False
     
     def auto_promote_if_better(
@@ -189,7 +307,9 @@ class ModelRegistry:
         """
         Automatically register and promote model if it performs better.
         
-        This is the main function to use after training a model.
+        This is the main function to use after training a model. Reruns for
+        the same run against an unchanged Production version reuse the
+        recorded decision instead of registering and comparing again.
         
         Args:
             run_id: MLflow run ID of the trained model
@@ -200,32 +320,52 @@ class ModelRegistry:
         Returns:
             Model version if promoted, None otherwise
         """
-        print("\n" + "="*60)
-        print("🤖 AUTOMATIC MODEL PROMOTION EVALUATION")
-        print("="*60)
+        logger.info("="*60)
+        logger.info("🤖 AUTOMATIC MODEL PROMOTION EVALUATION")
+        logger.info("="*60)
+        
+        # Look up the current Production model once and share it below
+        prod_versions = self.get_production_versions()
+        # Registry versions are ints, the cache stores text: compare as str
+        prod_version = str(prod_versions[0].version) if prod_versions else None
+        
+        # A rerun for an already evaluated run reuses the earlier decision
+        cached = self._cached_decision(run_id, metric_name, prod_version)
+        if cached is not None:
+            version, decided = cached
+            logger.info(f"♻️ Reusing earlier decision for run {run_id} (v{version})")
+            return version if decided else None
         
         # Register the model
         version = self.register_model(run_id, artifact_path)
+        prod_metrics = self.get_production_model_metrics(prod_versions)
         
         # Compare with production
         is_better = self.compare_models(
             candidate_run_id=run_id,
             metric_name=metric_name,
-            higher_is_better=higher_is_better
+            higher_is_better=higher_is_better,
+            prod_metrics=prod_metrics,
+            prod_versions=prod_versions
         )
         
         if is_better:
-            success = self.promote_to_production(version)
+            success = self.promote_to_production(
+                version,
+                existing_prod_versions=prod_versions
+            )
             
             if success:
-                print("\n" + "="*60)
-                print(f"✅ MODEL v{version} PROMOTED TO PRODUCTION")
-                print("="*60 + "\n")
+                self._record_decision(run_id, version, version, metric_name, True)
+                logger.info("="*60)
+                logger.info(f"✅ MODEL v{version} PROMOTED TO PRODUCTION")
+                logger.info("="*60)
                 return version
         else:
-            print("\n" + "="*60)
-            print(f"❌ MODEL v{version} NOT PROMOTED (performance insufficient)")
-            print("="*60 + "\n")
+            self._record_decision(run_id, version, prod_version, metric_name, False)
+            logger.info("="*60)
+            logger.info(f"❌ MODEL v{version} NOT PROMOTED (performance insufficient)")
+            logger.info("="*60)
         
         return None
 
@@ -1,12 +1,29 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, model_validator
+from typing import Any, Callable, List
+from dataclasses import dataclass, field, replace
+import asyncio
+import threading
 import mlflow
 import mlflow.pyfunc
+from mlflow.exceptions import MlflowException
 import pandas as pd
 import numpy as np
 import os
+import time
 from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
+from src.feature_engineering import GENDER_CATEGORIES, build_features
+from src.feature_engineering_fast import build_row, wall_clock_seconds, warmup
+from src.logging_utils import get_logger
+from src.model_cache import load_model_cached
+
+try:
+    import tl2cgen
+except ImportError:  # optional: compiled Treelite models are then ignored
+    tl2cgen = None
+
+logger = get_logger("predict")
 
 app = FastAPI(title="No-Show Predictor API", version="1.0.0")
 
@@ -23,6 +40,13 @@ class PredictionRequest(BaseModel):
     alcoholism: bool
     handicap: int
     sms_received: bool
+    
+    @model_validator(mode="after")
+    def check_timestamps(self):
+        # Same rule for /predict and /predict_batch: unparseable or mixed
+        # naive/offset timestamps are a 422, not a scoring error
+        wall_clock_seconds(self.scheduled_day, self.appointment_day)
+        return self
 
 class PredictionResponse(BaseModel):
     probability: float
@@ -31,148 +55,470 @@ class PredictionResponse(BaseModel):
     model_version: str
     prediction_timestamp: str
 
-# Global model state
-model = None
-model_info = {"name": "unknown", "version": "unknown"}
+class BatchPredictionRequest(BaseModel):
+    items: List[PredictionRequest]
+
+@dataclass(frozen=True)
+class ModelState:
+    """
+    A loaded model version and everything derived from it. Scoring threads
+    read one snapshot, so a reload is swapped in as a single assignment.
+    """
+    model: Any = None
+    info: dict = field(default_factory=lambda: {"name": "unknown", "version": "unknown"})
+    version: str | None = None
+    booster: Any = None  # raw XGBoost booster when the model flavor allows it
+    predict_proba: Callable | None = None
+    compiled: Any = None  # TL2cgen predictor when the run has a compiled model
+    # Category mapping logged with the model
+    gender_codes: dict = field(default_factory=lambda: {c: i for i, c in enumerate(GENDER_CATEGORIES)})
+    gender_dtype: pd.CategoricalDtype = pd.CategoricalDtype(GENDER_CATEGORIES)
+
+# Global model state, only replaced while holding _refresh_lock
+_state = ModelState()
+_refresh_lock = threading.Lock()
+_last_check_ts: float = 0.0
 
 # MLflow configuration
 MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "file:///app/mlruns")
 MODEL_NAME = os.getenv("MODEL_NAME", "noshow-prediction-model")
+RELOAD_TTL_SECONDS = float(os.getenv("MODEL_RELOAD_TTL_SECONDS", "60"))
+# Micro-batching of concurrent /predict calls (window caps collection, 0 disables it)
+BATCH_WINDOW_MS = float(os.getenv("PREDICT_BATCH_WINDOW_MS", "5"))
+BATCH_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64"))
+
+# Feature selection (must match training features)
+FEATURES = [
+    'hour_block', 'day_of_week', 'is_holiday_or_weekend', 'lead_time_days',
+    'same_day_appointment', 'appointment_month',
+    'age', 'gender', 'scholarship', 'hypertension', 'diabetes',
+    'alcoholism', 'handicap', 'sms_received'
+]
+
+# Request fields as columns, with dtypes declared up front instead of inferred
+# ('gender' is added per call from the loaded model's category mapping)
+REQUEST_COLUMNS = [
+    'patient_id', 'gender', 'age', 'scheduled_day', 'appointment_day',
+    'neighbourhood', 'scholarship', 'hypertension', 'diabetes', 'alcoholism',
+    'handicap', 'sms_received'
+]
+# Flags are bools; unbounded ints stay int64 so out-of-range values cannot wrap
+REQUEST_DTYPES = {
+    'patient_id': 'int64', 'age': 'int64', 'scholarship': 'int8',
+    'hypertension': 'int8', 'diabetes': 'int8', 'alcoholism': 'int8',
+    'handicap': 'int64', 'sms_received': 'int8'
+}
+
+# One client for the process lifetime; models:/ URIs resolve via the global URI
+mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
+_CLIENT = mlflow.MlflowClient(tracking_uri=MLFLOW_TRACKING_URI)
+
+def _extract_booster(pyfunc_model):
+    """Return the XGBoost booster behind a pyfunc model, or None for other flavors."""
+    if "xgboost" not in pyfunc_model.metadata.flavors:
+        return None
+    try:
+        raw_model = pyfunc_model.get_raw_model()
+        return raw_model.get_booster() if hasattr(raw_model, "get_booster") else raw_model
+    except Exception as e:
+        logger.warning(f"⚠️ Could not access XGBoost booster, using pyfunc: {e}")
+        return None
+
+def _extract_proba_fn(pyfunc_model):
+    """
+    Return a function mapping features to positive-class probabilities.
+    Uses the raw model's predict_proba when the flavor exposes one, otherwise
+    the pyfunc predict output is taken to be the probability.
+    """
+    try:
+        raw_model = pyfunc_model.get_raw_model()
+    except Exception:
+        raw_model = None
+    
+    if hasattr(raw_model, "predict_proba"):
+        return lambda X: raw_model.predict_proba(X)[:, 1]
+    return lambda X: np.asarray(pyfunc_model.predict(X), dtype=float)
+
+def find_latest_version():
+    """Newest registered version of MODEL_NAME regardless of stage, or None."""
+    try:
+        latest = _CLIENT.search_model_versions(
+            f"name='{MODEL_NAME}'",
+            max_results=1,
+            order_by=["version_number DESC"]
+        )
+        return latest[0] if latest else None
+    except MlflowException:
+        # Registry without order_by support: scan all versions
+        all_versions = _CLIENT.search_model_versions(f"name='{MODEL_NAME}'")
+        return max(all_versions, key=lambda x: int(x.version), default=None)
 
-def load_production_model():
+def _load_categories(run_id: str) -> List[str]:
+    """Return the gender category mapping from the model's run, or the default if absent."""
+    try:
+        return mlflow.artifacts.load_dict(f"runs:/{run_id}/categories.json")["gender"]
+    except Exception:
+        return GENDER_CATEGORIES
+
+def _load_compiled(run_id: str):
+    """Return a predictor for the run's compiled model library, or None if absent."""
+    if tl2cgen is None:
+        return None
+    try:
+        libpath = mlflow.artifacts.download_artifacts(
+            run_id=run_id, artifact_path="compiled/model.so"
+        )
+        return tl2cgen.Predictor(libpath)
+    except Exception:
+        return None
+
+def _activate(model_version, stage: str) -> ModelState:
+    """Load a registered model version and everything derived from it."""
+    loaded = load_model_cached(model_version)
+    booster = _extract_booster(loaded)
+    compiled = _load_compiled(model_version.run_id) if booster is not None else None
+    categories = _load_categories(model_version.run_id)
+    if compiled is not None:
+        logger.info("⚡ Using compiled Treelite model for scoring")
+    # SQL registries report versions as int, file stores as str
+    version = str(model_version.version)
+    return ModelState(
+        model=loaded,
+        info={"name": MODEL_NAME, "version": version, "stage": stage},
+        version=version,
+        booster=booster,
+        predict_proba=_extract_proba_fn(loaded),
+        compiled=compiled,
+        gender_codes={c: i for i, c in enumerate(categories)},
+        gender_dtype=pd.CategoricalDtype(categories)
+    )
+
+def load_production_model(force: bool = False):
     """
     Dynamically load the model currently in Production stage from MLflow Registry.
     This ensures zero-downtime model replacement - when a new model is promoted,
     the next prediction will automatically use it.
+    
+    The registry is only asked for the current Production version; the model
+    artifact itself is only downloaded when that version differs from the one
+    already loaded, or when force is set.
     """
-    global model, model_info
+    with _refresh_lock:
+        _load_production_model(force)
+
+def _load_production_model(force: bool):
+    global _state, _last_check_ts
+    current = _state
     
     try:
-        mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
-        client = mlflow.MlflowClient()
-        
         # Get the model version in Production stage
-        prod_models = client.get_latest_versions(MODEL_NAME, stages=["Production"])
+        prod_models = _CLIENT.get_latest_versions(MODEL_NAME, stages=["Production"])
+        _last_check_ts = time.monotonic()
         
         if not prod_models:
-            print(f"⚠️ No Production model found for '{MODEL_NAME}'. Attempting 'None' stage fallback...")
+            logger.warning(f"⚠️ No Production model found for '{MODEL_NAME}'. Attempting 'None' stage fallback...")
             # Fallback: get latest version regardless of stage
-            all_versions = client.search_model_versions(f"name='{MODEL_NAME}'")
-            if all_versions:
-                latest = max(all_versions, key=lambda x: int(x.version))
-                model_uri = f"models:/{MODEL_NAME}/{latest.version}"
-                model = mlflow.pyfunc.load_model(model_uri)
-                model_info = {"name": MODEL_NAME, "version": latest.version, "stage": "None"}
-                print(f"✅ Loaded fallback model: {MODEL_NAME} v{latest.version}")
+            latest = find_latest_version()
+            if latest:
+                if not force and current.model is not None and current.version == str(latest.version):
+                    return
+                _state = _activate(latest, stage="None")
+                logger.info(f"✅ Loaded fallback model: {MODEL_NAME} v{latest.version}")
                 return
             else:
-                print(f"❌ No models found for '{MODEL_NAME}'")
-                model_info = {"name": "none", "version": "0", "stage": "none"}
+                logger.error(f"❌ No models found for '{MODEL_NAME}'")
+                _state = replace(current, info={"name": "none", "version": "0", "stage": "none"}, version=None)
                 return
         
         # Load the Production model
         prod_model = prod_models[0]
-        model_uri = f"models:/{MODEL_NAME}/Production"
+        if not force and current.model is not None and current.version == str(prod_model.version):
+            return
         
-        print(f"🔄 Loading Production model: {MODEL_NAME} v{prod_model.version}")
-        model = mlflow.pyfunc.load_model(model_uri)
-        model_info = {
-            "name": MODEL_NAME,
-            "version": prod_model.version,
-            "stage": "Production"
-        }
-        print(f"✅ Successfully loaded: {MODEL_NAME} v{prod_model.version}")
+        logger.info(f"🔄 Loading Production model: {MODEL_NAME} v{prod_model.version}")
+        _state = _activate(prod_model, stage="Production")
+        logger.info(f"✅ Successfully loaded: {MODEL_NAME} v{prod_model.version}")
         
     except Exception as e:
-        print(f"❌ Error loading model: {str(e)}")
-        print("🔧 Falling back to safe mode (random predictions)")
-        model = None
-        model_info = {"name": "fallback", "version": "0.0.0", "stage": "error"}
+        _last_check_ts = time.monotonic()
+        if current.model is not None:
+            # A failed re-check keeps serving the model already loaded
+            logger.warning(f"⚠️ Model refresh failed, keeping v{current.info['version']}: {str(e)}")
+            return
+        logger.error(f"❌ Error loading model: {str(e)}")
+        logger.warning("🔧 Falling back to safe mode (random predictions)")
+        _state = ModelState(info={"name": "fallback", "version": "0.0.0", "stage": "error"})
+
+def refresh_model_if_stale():
+    """Re-check the registry for a new Production version at most once per TTL."""
+    if time.monotonic() - _last_check_ts <= RELOAD_TTL_SECONDS:
+        return
+    # One thread refreshes; the others keep scoring with the current state
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        if time.monotonic() - _last_check_ts > RELOAD_TTL_SECONDS:
+            _load_production_model(force=False)
+    finally:
+        _refresh_lock.release()
 
 @app.on_event("startup")
 async def startup_event():
-    print("🚀 Starting No-Show Prediction API...")
-    print(f"📍 MLflow URI: {MLFLOW_TRACKING_URI}")
-    print(f"🎯 Model Name: {MODEL_NAME}")
+    logger.info("🚀 Starting No-Show Prediction API...")
+    logger.info(f"📍 MLflow URI: {MLFLOW_TRACKING_URI}")
+    logger.info(f"🎯 Model Name: {MODEL_NAME}")
     load_production_model()
+    warmup()
+    if BATCH_WINDOW_MS > 0:
+        _batcher.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await _batcher.stop()
+
+def build_feature_vector(request: PredictionRequest, state: ModelState) -> np.ndarray:
+    """Build the (1, n_features) model input for a single request without pandas."""
+    sched_ts, appt_ts = wall_clock_seconds(request.scheduled_day, request.appointment_day)
+    row = build_row(
+        request.age,
+        float(state.gender_codes.get(request.gender, np.nan)),
+        sched_ts,
+        appt_ts,
+        int(request.scholarship),
+        int(request.hypertension),
+        int(request.diabetes),
+        int(request.alcoholism),
+        request.handicap,
+        int(request.sms_received),
+    )
+    return row.reshape(1, -1)
+
+def build_feature_frame(requests: List[PredictionRequest], state: ModelState) -> pd.DataFrame:
+    """Build model inputs for many requests at once with the pandas feature pipeline."""
+    # Feature engineering (simplified - in production, use feature store)
+    df = pd.DataFrame.from_records(
+        [tuple(getattr(request, c) for c in REQUEST_COLUMNS) for request in requests],
+        columns=REQUEST_COLUMNS
+    ).astype({**REQUEST_DTYPES, 'gender': state.gender_dtype})
+    
+    # Only the datetime conversion from preprocess(): its filtering and
+    # sorting would drop or reorder rows and break the response order.
+    # Each row is parsed on its own appointment's wall clock like /predict
+    # does; a column-wide pd.to_datetime needs one format and one offset.
+    seconds = np.array(
+        [wall_clock_seconds(r.scheduled_day, r.appointment_day) for r in requests],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    df['scheduled_day'] = pd.to_datetime(seconds[:, 0], unit='s')
+    df['appointment_day'] = pd.to_datetime(seconds[:, 1], unit='s')
+    df = build_features(df)
+    
+    return df[FEATURES].fillna({f: 0 for f in FEATURES if f != 'gender'})
+
+def score(X, state: ModelState) -> np.ndarray:
+    """Return no-show probabilities for a feature matrix using the state's model."""
+    if state.booster is not None:
+        if isinstance(X, pd.DataFrame):
+            # Category codes are what the booster splits on; unknown values become missing
+            codes = X['gender'].cat.codes
+            X = X.assign(gender=codes.where(codes >= 0))
+        X = np.asarray(X, dtype=np.float32)
+        if state.compiled is not None:
+            return np.asarray(state.compiled.predict(tl2cgen.DMatrix(X))).reshape(len(X))
+        return state.booster.inplace_predict(X)
+    
+    # Predict using MLflow model
+    return state.predict_proba(X)
+
+def predict_rows(requests: List[PredictionRequest], state: ModelState) -> np.ndarray:
+    """Score a small group of requests, using the NumPy row builder when possible."""
+    if state.booster is not None:
+        # Fast path: score the raw booster on NumPy rows, no DataFrame
+        return score(np.vstack([build_feature_vector(r, state) for r in requests]), state)
+    return score(build_feature_frame(requests, state), state)
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row predictions and scores them with one model
+    call, so per-call model overhead is paid once per batch. Requests queued
+    while a batch is scored form the next one; the window only caps how long
+    a batch keeps collecting, it is never waited out when the queue is empty.
+    """
+    
+    def __init__(self, window_ms: float, max_size: int):
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batch: list = []  # batch being scored, failed on stop()
+    
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+        
+        # Nobody will score these any more; don't leave their callers waiting
+        error = RuntimeError("Prediction batcher stopped")
+        pending = self._batch
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for *_, future in pending:
+            self._resolve(future, error=error)
+        self._batch = []
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    async def submit(self, request: PredictionRequest, state: ModelState) -> float:
+        """Score a request with the given model state, batched with concurrent calls."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, state, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.window
+                # Take what is already queued; a lone request is flushed right away
+                while len(batch) < self.max_size and loop.time() < deadline:
+                    if self._queue.empty():
+                        # Let requests that are already being handled enqueue first
+                        await asyncio.sleep(0)
+                        if self._queue.empty():
+                            break
+                    batch.append(self._queue.get_nowait())
+                
+                await self._score(batch)
+            except Exception as e:
+                # Keep the loop alive and fail whatever this batch left unresolved
+                logger.error(f"❌ Prediction batch failed: {e}")
+                for *_, future in batch:
+                    self._resolve(future, error=e)
+            self._batch = []
+    
+    async def _score(self, batch):
+        # Requests are scored with the state their caller reports in the
+        # response; a refresh mid-batch splits it into one group per state
+        groups = []
+        for item in batch:
+            if groups and groups[-1][0][1] is item[1]:
+                groups[-1].append(item)
+            else:
+                groups.append([item])
+        for group in groups:
+            await self._score_group(group, group[0][1])
+    
+    async def _score_group(self, batch, state: ModelState):
+        try:
+            probas = self._probabilities(
+                await run_in_threadpool(predict_rows, [r for r, *_ in batch], state), len(batch)
+            )
+        except Exception as e:
+            if len(batch) == 1:
+                self._resolve(batch[0][2], error=e)
+            else:
+                # Re-score one by one so only the failing request gets the error
+                await self._score_each(batch, state)
+            return
+        
+        for (*_, future), proba in zip(batch, probas):
+            self._resolve(future, result=float(proba))
+    
+    async def _score_each(self, batch, state: ModelState):
+        for request, _, future in batch:
+            try:
+                proba = self._probabilities(
+                    await run_in_threadpool(predict_rows, [request], state), 1
+                )[0]
+            except Exception as e:
+                self._resolve(future, error=e)
+            else:
+                self._resolve(future, result=float(proba))
+    
+    @staticmethod
+    def _probabilities(output, n: int) -> np.ndarray:
+        """Flatten model output to one probability per request, or raise."""
+        probas = np.asarray(output, dtype=float).reshape(-1)
+        if len(probas) != n:
+            raise ValueError(f"Model returned {len(probas)} predictions for {n} requests")
+        return probas
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: float | None = None, error: Exception | None = None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+_batcher = MicroBatcher(BATCH_WINDOW_MS, BATCH_MAX_SIZE)
+
+def make_response(proba: float, timestamp: str, info: dict) -> PredictionResponse:
+    return PredictionResponse(
+        probability=float(proba),
+        is_no_show=bool(proba > 0.5),
+        model_name=info["name"],
+        model_version=info["version"],
+        prediction_timestamp=timestamp
+    )
 
 @app.post("/predict", response_model=PredictionResponse)
-def predict(request: PredictionRequest):
+async def predict(request: PredictionRequest):
     """
     Predict no-show probability for a medical appointment.
     Automatically uses the latest Production model from MLflow.
     """
-    # Reload model on each prediction to ensure latest Production model is used
-    # (In high-traffic production, use a scheduled reload or cache with TTL)
-    load_production_model()
+    # Pick up newly promoted Production models without reloading on every request
+    await run_in_threadpool(refresh_model_if_stale)
+    state = _state
     
-    if not model:
+    if not state.model:
         # Fallback for demo if no model is available
-        return PredictionResponse(
-            probability=0.5,
-            is_no_show=False,
-            model_name=model_info["name"],
-            model_version=model_info["version"],
-            prediction_timestamp=datetime.utcnow().isoformat()
-        )
+        return make_response(0.5, datetime.utcnow().isoformat(), state.info)
     
     try:
-        # Feature engineering (simplified - in production, use feature store)
-        from src.feature_engineering import build_features, preprocess
-        
-        # Create DataFrame from request
-        df = pd.DataFrame([{
-            'patient_id': request.patient_id,
-            'gender': request.gender,
-            'age': request.age,
-            'scheduled_day': request.scheduled_day,
-            'appointment_day': request.appointment_day,
-            'neighbourhood': request.neighbourhood,
-            'scholarship': int(request.scholarship),
-            'hypertension': int(request.hypertension),
-            'diabetes': int(request.diabetes),
-            'alcoholism': int(request.alcoholism),
-            'handicap': request.handicap,
-            'sms_received': int(request.sms_received),
-            'no_show': 0  # placeholder
-        }])
-        
-        # Apply feature engineering
-        df = preprocess(df)
-        df = build_features(df)
+        if _batcher.running:
+            proba = await _batcher.submit(request, state)
+        else:
+            proba = float((await run_in_threadpool(predict_rows, [request], state))[0])
         
-        # Add missing patient history features (use defaults for new patients)
-        df['rolling_no_show_rate'] = 0.2  # population average
-        df['prev_appointments'] = 0
-        df['gender_encoded'] = 1 if request.gender == 'M' else 0
-        
-        # Feature selection (must match training features)
-        features = [
-            'hour_block', 'day_of_week', 'is_holiday_or_weekend', 'lead_time_days',
-            'same_day_appointment', 'appointment_month',
-            'age', 'gender_encoded', 'scholarship', 'hypertension', 'diabetes',
-            'alcoholism', 'handicap', 'sms_received',
-            'rolling_no_show_rate', 'prev_appointments'
-        ]
-        
-        X = df[features].fillna(0)
-        
-        # Predict using MLflow model
-        prediction = model.predict(X)
-        
-        # Get probability if model supports it
-        try:
-            proba = model.predict_proba(X)[:, 1][0]
-        except:
-            proba = float(prediction[0])
+        return make_response(proba, datetime.utcnow().isoformat(), state.info)
         
-        return PredictionResponse(
-            probability=float(proba),
-            is_no_show=bool(proba > 0.5),
-            model_name=model_info["name"],
-            model_version=model_info["version"],
-            prediction_timestamp=datetime.utcnow().isoformat()
-        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.post("/predict_batch", response_model=List[PredictionResponse])
+def predict_batch(request: BatchPredictionRequest):
+    """
+    Predict no-show probabilities for many appointments in one call.
+    Features are built and scored for the whole batch at once.
+    """
+    refresh_model_if_stale()
+    state = _state
+    
+    timestamp = datetime.utcnow().isoformat()
+    if not request.items:
+        return []
+    
+    if not state.model:
+        return [make_response(0.5, timestamp, state.info) for _ in request.items]
+    
+    try:
+        probas = score(build_feature_frame(request.items, state), state)
+        return [make_response(proba, timestamp, state.info) for proba in probas]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
@@ -182,8 +528,8 @@ def health():
     """Health check endpoint for Cloud Run."""
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
-        "model_info": model_info,
+        "model_loaded": _state.model is not None,
+        "model_info": _state.info,
         "mlflow_uri": MLFLOW_TRACKING_URI
     }
 
@@ -194,11 +540,11 @@ def reload_model():
     Useful after promoting a new model to Production.
     """
     try:
-        load_production_model()
+        load_production_model(force=True)
         return {
             "status": "success",
             "message": "Model reloaded successfully",
-            "model_info": model_info
+            "model_info": _state.info
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
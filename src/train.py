@@ -1,3 +1,6 @@
+import os
+import tempfile
+from typing import Optional
 import xgboost as xgb
 import pandas as pd
 import joblib
@@ -5,10 +8,37 @@ import mlflow
 import mlflow.xgboost
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score, f1_score
-from sklearn.preprocessing import LabelEncoder
-from src.feature_engineering import load_data, preprocess, build_features, engineer_patient_history
+from src.feature_engineering import (
+    GENDER_CATEGORIES, load_data, preprocess, build_features, encode_categoricals
+)
 from src.model_registry import ModelRegistry
 
+def compile_model(booster: xgb.Booster, output_dir: str) -> Optional[str]:
+    """
+    Compile the booster into a native shared library with Treelite + TL2cgen.
+    Returns the library path, or None if the optional packages are missing.
+    """
+    try:
+        import treelite
+        import tl2cgen
+    except ImportError:
+        print("ℹ️ treelite/tl2cgen not installed, skipping model compilation")
+        return None
+    
+    try:
+        libpath = os.path.join(output_dir, "model.so")
+        tl_model = treelite.frontend.from_xgboost(booster)
+        tl2cgen.export_lib(
+            tl_model,
+            toolchain="gcc",
+            libpath=libpath,
+            params={"parallel_comp": 4, "quantize": 1}
+        )
+        return libpath
+    except Exception as e:
+        print(f"⚠️ Model compilation failed, serving will use XGBoost: {e}")
+        return None
+
 def train_model(data_path: str, model_path: str = "models/xgboost_model.json"):
     mlflow.set_experiment("noshow-prediction")
     
@@ -18,46 +48,65 @@ def train_model(data_path: str, model_path: str = "models/xgboost_model.json"):
         df = load_data(data_path)
         df = preprocess(df)
         df = build_features(df)
-        df = engineer_patient_history(df)
         
-        # Encoders
-        le_gender = LabelEncoder()
-        df['gender_encoded'] = le_gender.fit_transform(df['gender'])
+        # Categoricals (handled natively by XGBoost)
+        df = encode_categoricals(df)
         
         # Feature Selection
         features = [
             'hour_block', 'day_of_week', 'is_holiday_or_weekend', 'lead_time_days', 
             'same_day_appointment', 'appointment_month',
-            'age', 'gender_encoded', 'scholarship', 'hypertension', 'diabetes', 
-            'alcoholism', 'handicap', 'sms_received',
-            'rolling_no_show_rate', 'prev_appointments'
+            'age', 'gender', 'scholarship', 'hypertension', 'diabetes', 
+            'alcoholism', 'handicap', 'sms_received'
         ]
         
-        X = df[features].fillna(0)
+        X = df[features].fillna({f: 0 for f in features if f != 'gender'})
         y = df['no_show']
         
-        # Split
+        # Split (early stopping watches a validation slice of the training set)
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_train, X_val, y_train, y_val = train_test_split(X_train, y_train, test_size=0.1, random_state=42)
+        
+        dtrain = xgb.DMatrix(X_train, y_train, enable_categorical=True)
+        dval = xgb.DMatrix(X_val, y_val, enable_categorical=True)
+        dtest = xgb.DMatrix(X_test, enable_categorical=True)
         
         # Train
         ratio = (y_train == 0).sum() / (y_train == 1).sum()
         params = {
-            "n_estimators": 300,
+            "objective": "binary:logistic",
+            "tree_method": "hist",
+            "device": os.getenv("XGB_DEVICE", "cpu"),
             "max_depth": 6,
             "learning_rate": 0.1,
             "scale_pos_weight": ratio,
             "eval_metric": "auc"
         }
+        num_boost_round = 300
+        early_stopping_rounds = 20
         
-        mlflow.log_params(params)
+        mlflow.log_params({
+            **params,
+            "num_boost_round": num_boost_round,
+            "early_stopping_rounds": early_stopping_rounds
+        })
         
         print("Training XGBoost...")
-        model = xgb.XGBClassifier(**params)
-        model.fit(X_train, y_train)
+        model = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=num_boost_round,
+            evals=[(dval, "validation")],
+            early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=False
+        )
+        # Keep only the trees up to the best validation round
+        model = model[: model.best_iteration + 1]
+        mlflow.log_param("best_iteration", model.num_boosted_rounds() - 1)
         
         # Evaluate
-        preds = model.predict(X_test)
-        probs = model.predict_proba(X_test)[:, 1]
+        probs = model.predict(dtest)
+        preds = (probs > 0.5).astype(int)
         
         auc = roc_auc_score(y_test, probs)
         acc = accuracy_score(y_test, preds)
@@ -67,6 +116,13 @@ def train_model(data_path: str, model_path: str = "models/xgboost_model.json"):
         
         mlflow.log_metrics({"auc": auc, "accuracy": acc, "f1": f1})
         mlflow.xgboost.log_model(model, "model")
+        mlflow.log_dict({"gender": GENDER_CATEGORIES}, "categories.json")
+        
+        # Compiled model for faster serving (picked up by src/predict.py if present)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            libpath = compile_model(model, tmp_dir)
+            if libpath:
+                mlflow.log_artifact(libpath, "compiled")
         
         # Save local artifact
         model.save_model(model_path)
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+import mlflow
+import mlflow.xgboost
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+# src.predict creates its MLflow client at import time; keep it off ./mlruns
+os.environ.setdefault(
+    "MLFLOW_TRACKING_URI", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'mlflow.db')}"
+)
+
+
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    """A throwaway SQLite-backed tracking store and model registry."""
+    uri = f"sqlite:///{tmp_path / 'mlflow.db'}"
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", uri)
+    mlflow.set_tracking_uri(uri)
+    # Artifacts would otherwise land in ./mlruns of the working directory
+    mlflow.create_experiment("test", artifact_location=(tmp_path / "artifacts").as_uri())
+    mlflow.set_experiment("test")
+    yield uri
+    mlflow.set_tracking_uri(None)
+
+
+@pytest.fixture
+def logged_run(tracking_uri):
+    """Log a tiny XGBoost booster the way train_model does and return its run ID."""
+    def _log(auc: float = 0.7) -> str:
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.random((50, 3)), columns=["a", "b", "c"])
+        y = (X["a"] > 0.5).astype(int)
+        booster = xgb.train(
+            {"objective": "binary:logistic"}, xgb.DMatrix(X, y), num_boost_round=2
+        )
+        with mlflow.start_run() as run:
+            mlflow.log_metrics({"auc": auc})
+            mlflow.xgboost.log_model(booster, name="model", pip_requirements=["xgboost"])
+        return run.info.run_id
+    return _log
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_engineering import build_features
+from src.feature_engineering_fast import build_row, wall_clock_seconds
+
+CALENDAR_FEATURES = [
+    'hour_block', 'day_of_week', 'is_holiday_or_weekend', 'lead_time_days',
+    'same_day_appointment', 'appointment_month'
+]
+
+APPOINTMENTS = [
+    "2016-09-07T09:00:00",  # Independence Day, a Wednesday
+    "2016-12-25T10:30:00",  # Christmas, a Sunday
+    "2016-04-21T12:00:00",  # Tiradentes
+    "2016-04-30T08:00:00",  # Saturday
+    "2016-05-01T07:59:59",  # Sunday and Labour Day
+    "2016-05-02T07:59:59",
+    "2016-05-02T11:59:59",
+    "2016-05-02T15:59:59",
+    "2016-05-02T16:00:00",
+    "2016-05-02T23:59:59",
+    "2016-01-31T23:59:59",
+    "2016-02-01T00:00:00",
+    "2016-02-29T13:00:00",
+    "2016-03-01T00:00:00",
+    "2016-12-31T23:00:00",
+    "2017-01-01T00:00:00",
+    "2028-12-31T12:00:00",  # last year of the holiday table
+    "2031-06-02T12:00:00",  # beyond the holiday table
+]
+LEAD_TIMES = [timedelta(0), timedelta(hours=5), timedelta(days=1, seconds=-1), timedelta(days=40)]
+
+
+def _cases():
+    for appointment in APPOINTMENTS:
+        for lead in LEAD_TIMES:
+            scheduled = (datetime.fromisoformat(appointment) - lead).isoformat()
+            yield scheduled, appointment
+
+
+def test_build_row_matches_build_features():
+    cases = list(_cases())
+    df = build_features(pd.DataFrame({
+        'scheduled_day': pd.to_datetime([s for s, _ in cases]),
+        'appointment_day': pd.to_datetime([a for _, a in cases]),
+    }))
+    expected = df[CALENDAR_FEATURES].to_numpy(dtype=np.float32)
+    
+    rows = np.vstack([
+        build_row(30, 1.0, *wall_clock_seconds(s, a), 0, 1, 0, 1, 2, 1)
+        for s, a in cases
+    ])
+    
+    np.testing.assert_array_equal(rows[:, :len(CALENDAR_FEATURES)], expected)
+    np.testing.assert_array_equal(
+        rows[:, len(CALENDAR_FEATURES):],
+        np.tile(np.array([30, 1, 0, 1, 0, 1, 2, 1], dtype=np.float32), (len(cases), 1))
+    )
+
+
+def test_build_row_uses_appointment_wall_clock_with_offsets():
+    sched_ts, appt_ts = wall_clock_seconds("2016-05-02T10:00:00+00:00", "2016-05-02T09:00:00-03:00")
+    assert appt_ts - sched_ts == 2 * 3600
+    assert build_row(30, 0.0, sched_ts, appt_ts, 0, 0, 0, 0, 0, 0)[0] == 1  # 09:00 local
+
+
+def test_wall_clock_seconds_rejects_mixed_timezones():
+    with pytest.raises(ValueError):
+        wall_clock_seconds("2016-05-02T08:00:00", "2016-05-02T09:00:00-03:00")
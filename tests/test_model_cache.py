@@ -0,0 +1,73 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import model_cache
+
+
+@pytest.fixture
+def loads(tmp_path, monkeypatch):
+    """Point the cache at tmp_path and record every real model load."""
+    monkeypatch.setattr(model_cache, "MODEL_CACHE_DIR", tmp_path)
+    calls = []
+    
+    def load_model(uri):
+        calls.append(uri)
+        return {"uri": uri}
+    
+    monkeypatch.setattr(model_cache.mlflow.pyfunc, "load_model", load_model)
+    return calls
+
+
+def _version(version: str):
+    return SimpleNamespace(
+        name="test-model", version=version, run_id=f"run-{version}", source=f"models:/m-{version}"
+    )
+
+
+def test_fresh_entry_is_loaded_once(loads):
+    first = model_cache.load_model_cached(_version("1"))
+    second = model_cache.load_model_cached(_version("1"))
+    
+    assert first == second == {"uri": "models:/test-model/1"}
+    assert loads == ["models:/test-model/1"]
+
+
+def test_stale_entry_is_reloaded(loads):
+    model_cache.load_model_cached(_version("1"), ttl_seconds=60)
+    path = model_cache._cache_entry(_version("1")) / "model.pkl"
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    
+    model_cache.load_model_cached(_version("1"), ttl_seconds=60)
+    model_cache.load_model_cached(_version("1"), ttl_seconds=60)
+    
+    assert len(loads) == 2
+
+
+def test_unreadable_entry_is_replaced(loads):
+    entry = model_cache._cache_entry(_version("1"))
+    entry.mkdir(parents=True)
+    (entry / "model.pkl").write_bytes(b"not a pickle")
+    
+    assert model_cache.load_model_cached(_version("1")) == {"uri": "models:/test-model/1"}
+    assert model_cache.load_model_cached(_version("1")) == {"uri": "models:/test-model/1"}
+    assert len(loads) == 1
+
+
+def test_eviction_keeps_most_recent_versions(loads, tmp_path):
+    now = time.time()
+    for age, version in [(300, "1"), (200, "2"), (100, "3")]:
+        model_cache.load_model_cached(_version(version), max_versions=2)
+        entry = model_cache._cache_entry(_version(version))
+        os.utime(entry, (now - age, now - age))
+    model_cache.load_model_cached(_version("4"), max_versions=2)
+    
+    model_dir = tmp_path / "test-model"
+    kept = sorted(p.name.split("-")[0] for p in model_dir.iterdir() if p.is_dir())
+    assert kept == ["3", "4"]
+    if model_cache.fcntl is not None:
+        locks = sorted(p.name.split("-")[0] for p in model_dir.glob("*.lock"))
+        assert locks == ["3", "4"]
@@ -0,0 +1,74 @@
+import sqlite3
+
+import mlflow.pyfunc
+import numpy as np
+import pandas as pd
+
+from src.model_registry import ModelRegistry
+
+
+def _registry(tracking_uri, **kwargs):
+    return ModelRegistry(tracking_uri=tracking_uri, model_name="test-model", **kwargs)
+
+
+def test_registered_version_can_be_promoted_and_loaded(tracking_uri, logged_run):
+    registry = _registry(tracking_uri, decision_cache_path=None)
+    version = registry.register_model(logged_run())
+
+    assert registry.promote_to_production(version)
+    assert [v.version for v in registry.get_production_versions()] == [int(version)]
+
+    model = mlflow.pyfunc.load_model(f"models:/test-model/{version}")
+    probs = model.predict(pd.DataFrame(np.zeros((2, 3)), columns=["a", "b", "c"]))
+    assert len(probs) == 2
+
+
+def test_first_run_registers_and_promotes(tracking_uri, logged_run, tmp_path):
+    registry = _registry(tracking_uri, decision_cache_path=str(tmp_path / "promotion.db"))
+
+    assert registry.get_production_versions() == []
+    assert registry.auto_promote_if_better(logged_run()) == "1"
+
+
+def test_rerun_of_same_run_reuses_decision(tracking_uri, logged_run, tmp_path):
+    registry = _registry(tracking_uri, decision_cache_path=str(tmp_path / "promotion.db"))
+    run_id = logged_run()
+
+    first = registry.auto_promote_if_better(run_id)
+    rerun = _registry(tracking_uri, decision_cache_path=str(tmp_path / "promotion.db"))
+    second = rerun.auto_promote_if_better(run_id)
+
+    assert first == second == "1"
+    assert len(registry.client.search_model_versions("name='test-model'")) == 1
+    assert [v.version for v in registry.get_production_versions()] == [1]
+
+
+def test_decisions_are_kept_per_metric_and_model(tracking_uri, tmp_path):
+    cache = str(tmp_path / "promotion.db")
+    registry = _registry(tracking_uri, decision_cache_path=cache)
+    other = ModelRegistry(tracking_uri=tracking_uri, model_name="other-model", decision_cache_path=cache)
+    
+    registry._record_decision("run", "1", "1", "auc", True)
+    registry._record_decision("run", "2", None, "f1", False)
+    other._record_decision("run", "5", None, "auc", False)
+    
+    assert registry._cached_decision("run", "auc", 1) == ("1", True)
+    assert registry._cached_decision("run", "f1", None) == ("2", False)
+    assert other._cached_decision("run", "auc", None) == ("5", False)
+
+
+def test_decision_cache_keyed_on_run_id_alone_is_replaced(tracking_uri, tmp_path):
+    path = tmp_path / "promotion.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE decisions (run_id TEXT PRIMARY KEY, model_name TEXT, version TEXT, "
+            "prod_version TEXT, metric TEXT, decided INTEGER, ts REAL)"
+        )
+    conn.close()
+    
+    registry = _registry(tracking_uri, decision_cache_path=str(path))
+    registry._record_decision("run", "1", "1", "auc", True)
+    registry._record_decision("run", "2", None, "f1", False)
+    
+    assert registry._cached_decision("run", "auc", "1") == ("1", True)
+    assert registry._cached_decision("run", "f1", None) == ("2", False)
@@ -0,0 +1,199 @@
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src import predict
+
+
+def _fake_predict_rows(requests, state):
+    if any(r == "bad" for r in requests):
+        raise ValueError("bad request")
+    return np.full(len(requests), 0.25)
+
+
+def test_batcher_fails_only_the_bad_request(monkeypatch):
+    monkeypatch.setattr(predict, "predict_rows", _fake_predict_rows)
+    
+    async def run():
+        batcher = predict.MicroBatcher(window_ms=50, max_size=8)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(r, predict.ModelState()) for r in ["ok", "bad", "ok"]),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+    
+    ok1, bad, ok2 = asyncio.run(run())
+    assert ok1 == ok2 == 0.25
+    assert isinstance(bad, ValueError)
+
+
+def test_batcher_flushes_lone_request_without_waiting_out_window(monkeypatch):
+    monkeypatch.setattr(predict, "predict_rows", _fake_predict_rows)
+    
+    async def run():
+        batcher = predict.MicroBatcher(window_ms=10_000, max_size=8)
+        batcher.start()
+        try:
+            return await asyncio.wait_for(batcher.submit("ok", predict.ModelState()), timeout=2)
+        finally:
+            await batcher.stop()
+    
+    assert asyncio.run(run()) == pytest.approx(0.25)
+
+
+class _UnavailableRegistry:
+    def get_latest_versions(self, *args, **kwargs):
+        raise ConnectionError("registry unavailable")
+
+
+def test_failed_refresh_keeps_loaded_model(monkeypatch):
+    loaded = predict.ModelState(
+        model=object(), info={"name": "m", "version": "3", "stage": "Production"}, version="3"
+    )
+    monkeypatch.setattr(predict, "_state", loaded)
+    monkeypatch.setattr(predict, "_CLIENT", _UnavailableRegistry())
+    
+    predict.load_production_model()
+    
+    assert predict._state is loaded
+
+
+def test_failed_first_load_falls_back_to_safe_mode(monkeypatch):
+    monkeypatch.setattr(predict, "_state", predict.ModelState())
+    monkeypatch.setattr(predict, "_CLIENT", _UnavailableRegistry())
+    
+    predict.load_production_model()
+    
+    assert predict._state.model is None
+    assert predict._state.info["stage"] == "error"
+
+
+def test_refresh_skips_while_another_thread_is_reloading(monkeypatch):
+    monkeypatch.setattr(predict, "_last_check_ts", 0.0)
+    monkeypatch.setattr(predict, "_CLIENT", _UnavailableRegistry())
+    
+    with predict._refresh_lock:
+        predict.refresh_model_if_stale()  # must not block or re-check
+    
+    assert predict._last_check_ts == 0.0
+
+
+def _request(**overrides):
+    fields = dict(
+        patient_id=1, gender="F", age=30,
+        scheduled_day="2016-04-29T08:00:00", appointment_day="2016-05-02T09:30:00",
+        neighbourhood="CENTRO", scholarship=False, hypertension=True, diabetes=False,
+        alcoholism=False, handicap=0, sms_received=True
+    )
+    fields.update(overrides)
+    return predict.PredictionRequest(**fields)
+
+
+def test_feature_frame_keeps_out_of_range_ints():
+    frame = predict.build_feature_frame(
+        [_request(age=40000, handicap=200)], predict.ModelState()
+    )
+    assert frame["age"].iloc[0] == 40000
+    assert frame["handicap"].iloc[0] == 200
+
+
+@pytest.mark.parametrize("path", ["/predict", "/predict_batch"])
+def test_mixed_timezones_are_rejected_on_both_endpoints(path):
+    item = _request().model_dump() | {"appointment_day": "2016-05-02T09:30:00-03:00"}
+    payload = item if path == "/predict" else {"items": [item]}
+    
+    response = TestClient(predict.app).post(path, json=payload)
+    
+    assert response.status_code == 422
+
+
+def test_feature_frame_matches_feature_vectors_for_mixed_formats():
+    requests = [
+        _request(scheduled_day="2016-04-29T08:00:00Z", appointment_day="2016-05-02T12:00:00Z"),
+        _request(scheduled_day="2016-04-29T08:00:00-03:00", appointment_day="2016-05-02T15:59:00-03:00"),
+        _request(scheduled_day="2016-04-29T23:00:00+00:00", appointment_day="2016-04-30T07:00:00-03:00"),
+        _request(scheduled_day="2016-04-29T08:00:00", appointment_day="2016-04-29T08:00:00.250"),
+        _request(scheduled_day="2016-02-28 10:15", appointment_day="2016-03-01T00:00:00"),
+    ]
+    state = predict.ModelState()
+    
+    frame = predict.build_feature_frame(requests, state)
+    frame = frame.assign(gender=frame["gender"].cat.codes)
+    vectors = np.vstack([predict.build_feature_vector(r, state) for r in requests])
+    
+    np.testing.assert_array_equal(frame.to_numpy(dtype=np.float32), vectors)
+
+
+def _run_with_batcher(coro_fn):
+    async def run():
+        batcher = predict.MicroBatcher(window_ms=50, max_size=8)
+        batcher.start()
+        try:
+            return await coro_fn(batcher)
+        finally:
+            await batcher.stop()
+    return asyncio.run(run())
+
+
+def test_batcher_survives_malformed_model_output(monkeypatch):
+    outputs = iter([np.zeros((1, 2)), np.full(1, 0.75)])
+    monkeypatch.setattr(predict, "predict_rows", lambda requests, state: next(outputs))
+    
+    async def two_requests(batcher):
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(batcher.submit("ok", predict.ModelState()), timeout=2)
+        assert batcher.running
+        return await asyncio.wait_for(batcher.submit("ok", predict.ModelState()), timeout=2)
+    
+    assert _run_with_batcher(two_requests) == 0.75
+
+
+def test_batcher_fails_requests_on_short_output(monkeypatch):
+    monkeypatch.setattr(predict, "predict_rows", lambda requests, state: np.full(1, 0.25))
+    
+    async def three_requests(batcher):
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit("ok", predict.ModelState()) for _ in range(3)), return_exceptions=True),
+            timeout=2
+        )
+    
+    # The batch is short, so each request is re-scored on its own
+    assert _run_with_batcher(three_requests) == [0.25, 0.25, 0.25]
+
+
+def test_stopped_batcher_fails_pending_requests(monkeypatch):
+    monkeypatch.setattr(predict, "predict_rows", _fake_predict_rows)
+    
+    async def run():
+        batcher = predict.MicroBatcher(window_ms=50, max_size=8)
+        batcher._queue = asyncio.Queue()  # queue without a consumer
+        pending = asyncio.ensure_future(batcher.submit("ok", predict.ModelState()))
+        await asyncio.sleep(0)
+        batcher._task = asyncio.ensure_future(asyncio.sleep(3600))
+        await batcher.stop()
+        assert not batcher.running
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, timeout=2)
+    
+    asyncio.run(run())
+
+
+def test_batcher_scores_each_request_with_its_callers_state(monkeypatch):
+    v1 = predict.ModelState(info={"name": "m", "version": "1"}, version="1")
+    v2 = predict.ModelState(info={"name": "m", "version": "2"}, version="2")
+    monkeypatch.setattr(
+        predict, "predict_rows",
+        lambda requests, state: np.full(len(requests), float(state.version))
+    )
+    
+    async def mixed(batcher):
+        return await asyncio.gather(
+            batcher.submit("a", v1), batcher.submit("b", v2), batcher.submit("c", v1)
+        )
+    
+    assert _run_with_batcher(mixed) == [1.0, 2.0, 1.0]
@@ -0,0 +1,178 @@
+import json
+import time
+
+import pytest
+
+from scripts import trigger_model_deployment as trigger
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+        self.text = ""
+    
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Replays canned responses and records the requests made."""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+    
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(trigger.time, "sleep", recorded.append)
+    return recorded
+
+
+def _session(monkeypatch, *responses):
+    session = FakeSession(*responses)
+    monkeypatch.setattr(trigger, "_SESSION", session)
+    return session
+
+
+@pytest.mark.parametrize("status, headers, retry_server_errors, expected", [
+    (429, {}, True, True),
+    (429, {}, False, True),
+    (502, {}, True, True),
+    (502, {}, False, False),
+    (403, {"Retry-After": "5"}, False, True),
+    (403, {"X-RateLimit-Remaining": "0"}, False, True),
+    (403, {}, True, False),
+    (404, {}, True, False),
+])
+def test_is_retryable(status, headers, retry_server_errors, expected):
+    assert trigger._is_retryable(FakeResponse(status, headers), retry_server_errors) is expected
+
+
+def test_retry_delay_honors_rate_limit_headers():
+    assert trigger._retry_delay(FakeResponse(429, {"Retry-After": "7"}), 0) == 7
+    reset = str(int(time.time()) + 30)
+    delay = trigger._retry_delay(
+        FakeResponse(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}), 0
+    )
+    assert 25 <= delay <= 30
+
+
+def test_retry_delay_backs_off_with_jitter():
+    for attempt in range(10):
+        delay = trigger._retry_delay(FakeResponse(502), attempt)
+        assert 0 <= delay <= min(trigger.BACKOFF_MAX_SECONDS, trigger.BACKOFF_BASE_SECONDS * 2 ** attempt)
+
+
+def test_request_retries_until_success(monkeypatch, sleeps):
+    session = _session(monkeypatch, FakeResponse(502), FakeResponse(429), FakeResponse(200))
+    
+    assert trigger._request_with_backoff("GET", "https://api.github.com/x").status_code == 200
+    assert len(session.requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_request_gives_up_when_asked_to_wait_too_long(monkeypatch, sleeps):
+    session = _session(monkeypatch, FakeResponse(429, {"Retry-After": "3600"}), FakeResponse(200))
+    
+    assert trigger._request_with_backoff("GET", "https://api.github.com/x").status_code == 429
+    assert len(session.requests) == 1
+    assert sleeps == []
+
+
+def _rate_limit(remaining):
+    return FakeResponse(200, body={"resources": {"core": {"remaining": remaining}}})
+
+
+def test_dispatch_is_not_retried_on_server_error(monkeypatch, sleeps):
+    session = _session(monkeypatch, _rate_limit(100), FakeResponse(502), FakeResponse(204))
+    
+    with pytest.raises(SystemExit):
+        trigger.trigger_via_api("7", "owner", "repo", "model-promotion.yml", "token")
+    
+    assert [method for method, _ in session.requests] == ["GET", "POST"]
+
+
+def test_dispatch_is_retried_when_rate_limited(monkeypatch, sleeps):
+    session = _session(monkeypatch, _rate_limit(100), FakeResponse(429), FakeResponse(204))
+    
+    trigger.trigger_via_api("7", "owner", "repo", "model-promotion.yml", "token")
+    
+    assert [method for method, _ in session.requests] == ["GET", "POST", "POST"]
+
+
+@pytest.fixture
+def etag_cache(tmp_path, monkeypatch):
+    path = tmp_path / "gh_etags.json"
+    monkeypatch.setattr(trigger, "ETAG_CACHE_PATH", path)
+    monkeypatch.setattr(trigger, "_etag_cache", None)
+    return path
+
+
+def _stub_requests(monkeypatch, *responses):
+    sent = []
+    replies = list(responses)
+    
+    def request_with_backoff(method, url, retry_server_errors=True, **kwargs):
+        sent.append((method, url, kwargs.get("headers", {})))
+        return replies.pop(0)
+    
+    monkeypatch.setattr(trigger, "_request_with_backoff", request_with_backoff)
+    return sent
+
+
+def test_cached_get_reuses_body_on_not_modified(monkeypatch, etag_cache):
+    url = "https://api.github.com/repos/o/r/actions/runs"
+    sent = _stub_requests(
+        monkeypatch,
+        FakeResponse(200, {"ETag": '"abc"'}, body={"runs": [1]}),
+        FakeResponse(304)
+    )
+    
+    assert trigger.cached_get(url, "token") == {"runs": [1]}
+    assert "If-None-Match" not in sent[0][2]
+    assert json.loads(etag_cache.read_text())[url]["etag"] == '"abc"'
+    
+    monkeypatch.setattr(trigger, "_etag_cache", None)  # fresh process, cache from disk
+    assert trigger.cached_get(url, "token") == {"runs": [1]}
+    assert sent[1][2]["If-None-Match"] == '"abc"'
+
+
+def test_cached_get_returns_none_on_error(monkeypatch, etag_cache):
+    _stub_requests(monkeypatch, FakeResponse(500))
+    
+    assert trigger.cached_get("https://api.github.com/x", "token") is None
+    assert not etag_cache.exists()
+
+
+DISPATCHED_AT = trigger.datetime(2026, 10, 14, 12, 0, tzinfo=trigger.timezone.utc)
+NOT_BEFORE = DISPATCHED_AT - trigger.timedelta(seconds=trigger.CLOCK_SKEW_SECONDS)
+
+
+@pytest.mark.parametrize("created_at, title, expected", [
+    ("2026-10-14T12:00:05Z", "Model promotion v7", True),
+    ("2026-10-14T11:59:00Z", "Model promotion v7", True),  # runner clock ahead of GitHub's
+    ("2026-10-14T11:50:00Z", "Model promotion v7", False),  # outside the skew window
+    ("2026-10-14T12:00:05Z", "Model promotion v8", False),
+    ("2026-10-14T12:00:05Z", "Model Promotion Auto-Deploy", True),  # workflow without run-name
+    ("2026-10-14T11:50:00Z", "Model Promotion Auto-Deploy", False),
+])
+def test_is_dispatched_run(created_at, title, expected):
+    run = {"created_at": created_at, "display_title": title}
+    assert trigger._is_dispatched_run(run, "7", NOT_BEFORE) is expected
+
+
+def test_dispatch_aborts_below_rate_limit_floor(monkeypatch):
+    sent = _stub_requests(monkeypatch, _rate_limit(trigger.RATE_LIMIT_FLOOR - 1))
+    
+    with pytest.raises(SystemExit):
+        trigger.trigger_via_api("7", "owner", "repo", "model-promotion.yml", "token")
+    
+    assert [method for method, *_ in sent] == ["GET"]